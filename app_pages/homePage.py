@@ -1,18 +1,16 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
+from data_schema import read_data, validate
 
 @st.cache_data
 def get_data():
     """
     This function will only be re-run when the data is changed.
-    Read
+    Read and validate the data, returns the valid rows and the rows that failed validation.
+    Columns not in the schema (like 'departure_time_day_of_week') are dropped.
     """
-    data = pd.read_csv("data/data.csv")
-    # Drop the 'departure_time_day_of_week' column
-    data = data.drop(columns=['departure_time_day_of_week'])
-    data['departure_time'] = pd.to_datetime(data['departure_time'])
-    return data
+    return validate(read_data())
 
 @st.cache_data
 def get_columns_desc():
@@ -42,9 +40,14 @@ st.write("---")
 
 # Data Overview
 st.write("## Data Overview")
-data = get_data()
+data, quarantine = get_data()
 columns_decs = get_columns_desc()
 
+if len(quarantine):
+    st.warning(f"{len(quarantine):,} rows failed validation and were left out of the analysis")
+    with st.expander("Rows that failed validation"):
+        st.dataframe(quarantine, use_container_width=True)
+
 col1, col2, col3 = st.columns(3)
 with col1:
     st.metric("Total Rows", f"{len(data):,}")
@@ -58,7 +61,7 @@ summary_data = []
 for column in data.columns:
     col_type = data[column].dtype
     # Make sure time without statistics
-    if column == "departure_time":
+    if column == "departure_time" or column == "arrival_time":
         col_type = "object"
     unique_count = data[column].nunique()
     missing_count = data[column].isna().sum()
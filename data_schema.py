@@ -0,0 +1,228 @@
+"""
+Data contract for data/data.csv.
+
+The schema is generated from data/column_desc.csv (column names, labels and
+descriptions) together with the rules in COLUMN_RULES (dtypes, nullability,
+categorical domains and ranges). Every check is a column-wise vectorized
+operation (a second or two per million rows), rows that fail any check are
+moved to a quarantine file.
+
+Run on ingest (after the preprocessing step saved data.csv):
+    python data_schema.py data/data.csv
+"""
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = "data/data.csv"
+COLUMN_DESC_PATH = "data/column_desc.csv"
+QUARANTINE_PATH = "data/quarantine.csv"
+
+# The terror attack date, flights departing from this day on are "after"
+ATTACK_DATE = pd.Timestamp("2023-10-07")
+
+DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+CONTINENTS = ["Africa", "Antarctica", "Asia", "Europe", "North America", "Oceania", "South America"]
+
+
+class SchemaError(ValueError):
+    """
+    Raised when the data or the column description does not match the schema
+    (missing columns, undescribed rules), as opposed to bad rows.
+    """
+
+
+@dataclass(frozen=True)
+class ColumnSchema:
+    name: str
+    label: str
+    description: str
+    dtype: str  # "string", "datetime", "int" or "float"
+    nullable: bool = False
+    domain: Optional[tuple] = None
+    pattern: Optional[str] = None
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+
+
+COLUMN_RULES = {
+    "callsign": dict(dtype="string", nullable=True),
+    "departure_airport": dict(dtype="string", domain=("LLBG",)),
+    "arrival_airport": dict(dtype="string", pattern=r"[A-Z0-9]{4}"),
+    "departure_time": dict(dtype="datetime"),
+    "arrival_time": dict(dtype="datetime"),
+    "after_7_10_2023": dict(dtype="int", domain=(0, 1)),
+    "before_7_10_2023": dict(dtype="int", domain=(0, 1)),
+    "departure_time_month": dict(dtype="int", min_value=1, max_value=12),
+    "departure_time_day": dict(dtype="int", min_value=1, max_value=31),
+    "departure_time_hour": dict(dtype="int", min_value=0, max_value=23),
+    "departure_time_minute": dict(dtype="int", min_value=0, max_value=59),
+    "departure_time_day_name": dict(dtype="string", domain=tuple(DAY_NAMES)),
+    "airportName": dict(dtype="string"),
+    "latitude_deg": dict(dtype="float", min_value=-90, max_value=90),
+    "longitude_deg": dict(dtype="float", min_value=-180, max_value=180),
+    "continent": dict(dtype="string", domain=tuple(CONTINENTS)),
+    "country_code": dict(dtype="string", pattern=r"[A-Z]{2}"),
+    "municipality": dict(dtype="string"),
+    "country_name": dict(dtype="string"),
+}
+
+
+def load_schema(path=COLUMN_DESC_PATH) -> dict:
+    """
+    Build the schema from the column description file.
+    Returns a dict of column name -> ColumnSchema, in the file's column order.
+    """
+    desc = pd.read_csv(path, encoding='ISO-8859-1')
+    names = desc.iloc[:, 0].tolist()
+
+    missing_rules = [name for name in names if name not in COLUMN_RULES]
+    undescribed = [name for name in COLUMN_RULES if name not in names]
+    if missing_rules or undescribed:
+        raise SchemaError(f"Column description and rules do not match - "
+                          f"no rules for: {missing_rules}, not described: {undescribed}")
+
+    return {
+        row[0]: ColumnSchema(name=row[0], label=row[2], description=row[1], **COLUMN_RULES[row[0]])
+        for row in desc.itertuples(index=False)
+    }
+
+
+def read_data(path=DATA_PATH) -> pd.DataFrame:
+    """
+    Read the raw data CSV.
+    Only empty cells are missing values, so codes like "NA" (Namibia) are kept.
+    """
+    return pd.read_csv(path, keep_default_na=False, na_values=[""])
+
+
+def _coerce(values, column):
+    """
+    Convert a column to its schema dtype, unparsable values become missing.
+    """
+    if column.dtype == "datetime":
+        return pd.to_datetime(values, format='ISO8601', errors='coerce')
+    if column.dtype in ("int", "float"):
+        return pd.to_numeric(values, errors='coerce')
+    return values
+
+
+def _column_checks(raw, values, column):
+    """
+    Yield (check name, failing rows mask) for the single column checks.
+    """
+    name = column.name
+    raw_missing = raw.isna().to_numpy()
+    if not column.nullable:
+        yield f"{name}:null", raw_missing
+    if column.dtype == "string":
+        missing = raw_missing
+    else:
+        missing = values.isna().to_numpy()
+        yield f"{name}:dtype", missing & ~raw_missing
+
+    if column.dtype == "int":
+        yield f"{name}:not_integer", ~missing & (values.to_numpy() % 1 != 0)
+    if column.min_value is not None:
+        yield f"{name}:range", ~missing & (values.to_numpy() < column.min_value)
+    if column.max_value is not None:
+        yield f"{name}:range", ~missing & (values.to_numpy() > column.max_value)
+    if column.domain is not None:
+        yield f"{name}:domain", ~missing & ~values.isin(column.domain).to_numpy()
+    if column.pattern is not None:
+        # Match the (few) unique values only, then map back with a hash lookup
+        uniques = pd.Series(values.dropna().unique(), dtype=object)
+        bad = uniques[~uniques.astype(str).str.fullmatch(column.pattern)]
+        yield f"{name}:pattern", values.isin(bad).to_numpy()
+
+
+def _row_checks(data):
+    """
+    Yield (check name, failing rows mask) for the checks between columns.
+    A check only fails rows where all the columns it compares are known,
+    missing or invalid values are reported by the single column checks.
+    """
+    departure = data["departure_time"]
+    known = departure.notna().to_numpy()
+
+    after = data["after_7_10_2023"]
+    before = data["before_7_10_2023"]
+    flags_known = after.notna().to_numpy() & before.notna().to_numpy()
+    yield "before_after:exclusive", flags_known & ((after + before).to_numpy() != 1)
+    after_known = known & after.notna().to_numpy()
+    yield "before_after:departure_time", after_known & (after.to_numpy() != (departure >= ATTACK_DATE).to_numpy())
+
+    arrival_known = known & data["arrival_time"].notna().to_numpy()
+    yield "arrival_time:before_departure", arrival_known & (data["arrival_time"] < departure).to_numpy()
+
+    for part in ["month", "day", "hour", "minute"]:
+        values = data[f"departure_time_{part}"]
+        expected = getattr(departure.dt, part).to_numpy()
+        part_known = known & values.notna().to_numpy()
+        yield f"departure_time_{part}:departure_time", part_known & (values.to_numpy() != expected)
+    # Unknown day names map to NaN and are reported by the domain check
+    day_of_week = data["departure_time_day_name"].map({day: i for i, day in enumerate(DAY_NAMES)})
+    day_known = known & day_of_week.notna().to_numpy()
+    yield "departure_time_day_name:departure_time", day_known & (day_of_week.to_numpy() != departure.dt.dayofweek.to_numpy())
+
+
+def validate(data, schema=None):
+    """
+    Validate the data against the schema.
+    Columns that are not in the schema are dropped and every column is cast to its dtype.
+    Returns (clean, quarantine): the valid rows, and the failing rows as they were read
+    with a 'failed_checks' column listing the checks each row failed.
+    """
+    if schema is None:
+        schema = load_schema()
+
+    missing_columns = [name for name in schema if name not in data.columns]
+    if missing_columns:
+        raise SchemaError(f"Data is missing columns: {missing_columns}")
+
+    raw = data[list(schema)]
+    typed = pd.DataFrame({name: _coerce(raw[name], column) for name, column in schema.items()}, index=raw.index)
+
+    checks = {}
+    for name, column in schema.items():
+        for check, mask in _column_checks(raw[name], typed[name], column):
+            checks[check] = checks[check] | mask if check in checks else mask
+    checks.update(_row_checks(typed))
+
+    bad_rows = np.logical_or.reduce(list(checks.values()))
+
+    # Only the (few) failing rows get their list of failed checks
+    failed = np.column_stack([mask[bad_rows] for mask in checks.values()])
+    failed_checks = np.array(list(checks.keys()), dtype=object)
+    quarantine = raw[bad_rows].copy()
+    quarantine["failed_checks"] = [";".join(failed_checks[row]) for row in failed]
+
+    clean = typed[~bad_rows].copy()
+    for name, column in schema.items():
+        if column.dtype == "int":
+            clean[name] = clean[name].astype("int64")
+    return clean, quarantine
+
+
+def write_quarantine(quarantine, path=QUARANTINE_PATH):
+    """
+    Save the failing rows, keeping their row number in the original file.
+    """
+    quarantine.to_csv(path, index_label="row")
+
+
+def main(argv):
+    path = argv[1] if len(argv) > 1 else DATA_PATH
+    clean, quarantine = validate(read_data(path))
+    write_quarantine(quarantine)
+    print(f"{len(clean):,} valid rows, {len(quarantine):,} rows quarantined to {QUARANTINE_PATH}")
+    if len(quarantine):
+        print(quarantine["failed_checks"].str.split(";").explode().value_counts().to_string())
+    return 1 if len(quarantine) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))